@@ -17,13 +17,22 @@ Options:
 
 import datetime
 import docopt
+import functools
 import json
 import random
+import sys
 import time
 
 
 def _now():
-    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return _format_time(int(time.time()))
+
+
+@functools.lru_cache(maxsize=1)
+def _format_time(seconds):
+    # rtl_433 timestamps have one-second resolution, so records emitted within the
+    # same second (e.g. --interval 0) share one formatted string.
+    return datetime.datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M:%S")
 
 
 def _device_id(device_ids):
@@ -101,11 +110,18 @@ GENERATORS = {
 
 def run(model, device_ids, count, interval):
     generator = GENERATORS[model]
+    out = sys.stdout
     i = 0
     while count == 0 or i < count:
-        time.sleep(interval)
-        print(json.dumps(generator(device_ids)), flush=True)
+        # Paced records must reach the reader as they are made; at --interval 0 let
+        # the stream buffer them and write in blocks instead of once per line.
+        if interval:
+            time.sleep(interval)
+        out.write(json.dumps(generator(device_ids)) + "\n")
+        if interval:
+            out.flush()
         i += 1
+    out.flush()
 
 
 if __name__ == "__main__":
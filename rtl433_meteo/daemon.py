@@ -1,7 +1,8 @@
-import blinker
-import concurrent.futures
+import asyncio
 import logging
+import queue
 import signal
+import threading
 
 from .publish_vm import VictoriaMetricsPublisher
 from .rtl_reader import RtlReader
@@ -9,6 +10,16 @@ from . import stations
 
 logger = logging.getLogger(__name__)
 
+# Messages waiting to be pushed to VictoriaMetrics. Pushes block for up to the
+# publisher's timeout, so they run on their own thread and the reader keeps draining
+# rtl_433's pipe meanwhile. If VM stalls long enough to fill this, the oldest
+# message is dropped.
+PUBLISH_QUEUE_SIZE = 1024
+
+# How long shutdown waits for messages still queued to be pushed, in seconds. Keep
+# rtl433-meteo.initd's retry schedule longer than this.
+PUBLISH_DRAIN_TIMEOUT = 15
+
 
 class MeteoExporterDaemon:
     def __init__(
@@ -18,22 +29,52 @@ class MeteoExporterDaemon:
         vm_baseurl,
         registry=stations.STATIONS,
     ):
-        self.sig = blinker.signal("data-received")
-
         self.pub_vm = VictoriaMetricsPublisher(vm_baseurl, registry)
-        self.sig.connect(self.pub_vm.data_callback)
-
-        self.exc_watcher = concurrent.futures.Future()
-        self.thr_reader = RtlReader(rtl_cmd, registry.keys(), device_ids, self.sig, self.exc_watcher)
+        self.queue = queue.Queue(maxsize=PUBLISH_QUEUE_SIZE)
+        self.thr_publisher = threading.Thread(target=self._publish, name="vm-publisher", daemon=True)
+        self.reader = RtlReader(rtl_cmd, registry.keys(), device_ids, self._enqueue)
 
-    def run(self):
-        signal.signal(signal.SIGINT, lambda sig, frame: self.thr_reader.terminate_subprocess())
+    def _enqueue(self, data):
+        try:
+            self.queue.put_nowait(data)
+        except queue.Full:
+            # The reader is the only producer, so once the oldest entry is gone (taken
+            # here or by the publisher in the meantime) there is room again.
+            try:
+                dropped = self.queue.get_nowait()
+                logger.warning("vm: Publish queue full, dropping %s id=%s", dropped["model"], dropped["id"])
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(data)
 
-        self.thr_reader.start()
+    def _publish(self):
+        while (data := self.queue.get()) is not None:
+            try:
+                self.pub_vm.data_callback(data)
+            except Exception:
+                logger.exception("Exception while publishing %s", data)
 
+    def run(self):
+        self.thr_publisher.start()
         try:
-            self.exc_watcher.result()
-        except Exception as e:
-            logger.exception(f"Exception in background reader thread: {e}")
+            asyncio.run(self._run())
+        except Exception:
+            logger.exception("Exception in rtl_433 reader")
+        finally:
+            # None stops the publisher once everything queued before it is pushed.
+            self._enqueue(None)
+            self.thr_publisher.join(PUBLISH_DRAIN_TIMEOUT)
+            if self.thr_publisher.is_alive():
+                # qsize() still counts the None sentinel.
+                logger.warning("vm: Shutting down with %d message(s) not pushed", max(self.queue.qsize() - 1, 0))
+
+    async def _run(self):
+        # SIGINT (Ctrl-C, OpenRC) and SIGTERM (systemd) both stop rtl_433; the reader
+        # then drains what is left in its pipes and returns, ending the loop.
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.reader.terminate_subprocess)
 
-        self.thr_reader.join()
+        # The reader runs on this event loop in the main thread and only queues
+        # accepted messages; thr_publisher pushes them to VictoriaMetrics.
+        await self.reader.background_job()
@@ -1,4 +1,5 @@
 import datetime
+import functools
 import logging
 import requests
 import urllib.parse
@@ -8,21 +9,55 @@ from . import stations
 logger = logging.getLogger(__name__)
 
 # (connect, read) timeout in seconds. Bounds how long a stuck VictoriaMetrics can
-# block the reader thread before we give up on the sample and resume reading.
+# block the publisher thread before we give up on the sample and move on.
 DEFAULT_TIMEOUT = (5, 10)
 
+# Distinguishes "key absent from the message" from any value rtl_433 may send.
+_ABSENT = object()
+
+
+# rtl_433 stamps messages with local time at one-second resolution. Repeated
+# transmissions and messages from several stations often share a second, so cache
+# the conversion instead of running strptime for every message.
+@functools.lru_cache(maxsize=64)
+def _parse_time(value):
+    return int(datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S").timestamp())
+
 
 class VictoriaMetricsPublisher:
     def __init__(self, vmbaseurl, registry=stations.STATIONS, timeout=DEFAULT_TIMEOUT):
         self.vmbaseurl = vmbaseurl
+        self.import_url = urllib.parse.urljoin(vmbaseurl, "/api/v1/import/csv")
         self.registry = registry
         self.timeout = timeout
+        # One keep-alive session for every import: each message is two POSTs, which
+        # would otherwise each open (and tear down) their own TCP/TLS connection.
+        self.session = requests.Session()
+        # extra_label lists keyed by (model, id), built the first time a device is
+        # seen so the hot path does not re-format the same labels for every message.
+        self._labels = {}
+        # Per model, every field this publisher may export resolved once up front to
+        # (json_key, metric name, transform), so a message costs one dict lookup per
+        # key instead of re-resolving the Field and its METRICS entry each time.
+        self._fields = {
+            model: tuple(
+                (field.json_key, stations.METRICS[field.metric_key].name, field.transform)
+                for field in (*station.fields, *stations.COMMON_FIELDS)
+            )
+            for model, station in registry.items()
+        }
+
+    def _extra_labels(self, model, device_id):
+        labels = self._labels.get((model, device_id))
+        if labels is None:
+            labels = self._labels[(model, device_id)] = [f"id={device_id}", f"model={model}"]
+        return labels
 
     def _post(self, labels, data, format):
         # extra_label must be repeated once per label; a comma-joined string would be
         # stored by VictoriaMetrics as a single label whose value contains the comma.
-        resp = requests.post(
-            urllib.parse.urljoin(self.vmbaseurl, "/api/v1/import/csv"),
+        resp = self.session.post(
+            self.import_url,
             params={
                 "format": ",".join(format),
                 "extra_label": labels,
@@ -31,29 +66,30 @@ class VictoriaMetricsPublisher:
             timeout=self.timeout,
         )
         resp.raise_for_status()
-        logger.debug(f"vm: Posted data to VictoriaMetrics ({labels}): {data} (response: {resp.status_code})")
+        logger.debug("vm: Posted data to VictoriaMetrics (%s): %s (response: %s)", labels, data, resp.status_code)
 
-    def _construct_metrics(self, data, station, dt):
+    def _construct_metrics(self, data, station, ts):
         columns = ["1:time:unix_s"]
-        csv_line = [int(dt.timestamp())]
+        csv_line = [ts]
 
         # rtl_433 does not always transmit every field (e.g. a Vevor message
         # without "uvi"). Skip absent keys instead of crashing; the CSV column
         # index must stay contiguous, so track it separately from station.fields.
         col = 2
-        for field in (*station.fields, *stations.COMMON_FIELDS):
-            if field.json_key not in data:
+        for json_key, name, transform in self._fields[station.model]:
+            raw = data.get(json_key, _ABSENT)
+            if raw is _ABSENT:
                 continue
-            columns.append(f"{col}:metric:{stations.METRICS[field.metric_key].name}")
-            csv_line.append(field.value(data))
+            columns.append(f"{col}:metric:{name}")
+            csv_line.append(raw if transform is None else transform(raw))
             col += 1
 
         return csv_line, columns
 
-    def _construct_info(self, data, station, dt):
+    def _construct_info(self, data, station, ts):
         name = f"{stations.INFO_METRIC_NAME}_info"
         columns = ["1:time:unix_s", f"2:metric:{name}"]
-        csv_line = [int(dt.timestamp()), 1]
+        csv_line = [ts, 1]
 
         col = 3
         for key in station.info_keys:
@@ -67,15 +103,15 @@ class VictoriaMetricsPublisher:
 
     def data_callback(self, data):
         station = self.registry[data["model"]]
-        dt = datetime.datetime.strptime(data["time"], "%Y-%m-%d %H:%M:%S")
-        extra_label = [f"id={data['id']}", f"model={data['model']}"]
+        ts = _parse_time(data["time"])
+        extra_label = self._extra_labels(data["model"], data["id"])
 
-        # A VictoriaMetrics outage must not tear down the reader: log and drop the
-        # sample, the next message will be pushed once VM recovers.
+        # A VictoriaMetrics outage must not tear down the publisher thread: log and drop
+        # the sample, the next message will be pushed once VM recovers.
         try:
-            metrics_line, metrics_columns = self._construct_metrics(data, station, dt)
+            metrics_line, metrics_columns = self._construct_metrics(data, station, ts)
             self._post(extra_label, metrics_line, metrics_columns)
-            self._post(extra_label, *self._construct_info(data, station, dt))
+            self._post(extra_label, *self._construct_info(data, station, ts))
             logger.info("vm: Pushed %s id=%s (%d metrics)", data["model"], data["id"], len(metrics_columns) - 1)
         except requests.RequestException as e:
-            logger.error(f"vm: Failed to push to VictoriaMetrics ({extra_label}): {e}")
+            logger.error("vm: Failed to push to VictoriaMetrics (%s): %s", extra_label, e)
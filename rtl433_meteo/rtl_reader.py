@@ -1,90 +1,173 @@
 import asyncio
-import json
 import logging
 import os
+import re
+import shlex
 import signal
-import threading
+import time
+
+# orjson (the "fast" extra) parses rtl_433's output straight from bytes, several times
+# faster than the stdlib; json.loads accepts bytes too, so the fallback is a drop-in.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Bytes requested from the rtl_433 pipes per read. Whatever arrives is split into
+# lines in one go instead of a readline() round-trip through the event loop per line.
+READ_CHUNK_SIZE = 65536
 
-class RtlReader(threading.Thread):
-    """Runs the rtl_433 subprocess and dispatches messages of known models."""
+# Stations repeat each transmission and rtl_433 can decode several copies of it.
+# A message identical to the previous one from the same device (ignoring the keys
+# below, which differ between copies) within this many seconds is dropped.
+DUPLICATE_WINDOW = 0.5
+_VOLATILE_KEYS = frozenset({"time", "mod", "rssi", "snr", "noise", "freq", "freq1", "freq2"})
 
-    def __init__(self, cmd, models, device_ids, signal, future):
-        super().__init__()
 
+class RtlReader:
+    """Runs the rtl_433 subprocess and dispatches messages of known models."""
+
+    def __init__(self, cmd, models, device_ids, callback):
         self.cmd = self._parse_cmd(cmd)
         self.models = set(models)
-        self.device_ids = device_ids
-        self.signal = signal
-        self.future = future
+        # frozenset for O(1) membership on every message; the sorted list is kept for logs.
+        self.device_ids = frozenset(device_ids)
+        self._device_id_list = sorted(self.device_ids)
+        self.callback = callback
+        self.p = None
+        # Set by terminate_subprocess; a stop requested before rtl_433 is spawned is
+        # applied as soon as it is.
+        self._stopping = False
+        # (model, id) -> (fingerprint, monotonic time) of the last forwarded message.
+        self._last_message = {}
+
+        # Byte patterns matched against each raw stdout line before it is decoded, so
+        # output from other devices on the band is dropped without a JSON parse. They
+        # only pre-filter -- process_data still checks the decoded message. All
+        # configured ids are compiled into one regex scanned once per line; it allows
+        # any spacing around the colon (rtl_433 writes '"id" : 123').
+        self._model_needles = tuple(f'"{model}"'.encode() for model in sorted(self.models))
+        self._id_pattern = None
+        if self.device_ids:
+            ids = "|".join(str(device_id) for device_id in self._device_id_list)
+            self._id_pattern = re.compile(rf'"id"\s*:\s*(?:{ids})(?![0-9])'.encode())
 
         logger.info("rtl433: Listening for models: %s", ", ".join(sorted(self.models)))
-        if len(self.device_ids) == 0:
+        if not self.device_ids:
             logger.info("rtl433: Listening messages from all devices")
         else:
-            logger.info(f"rtl433: Listening messages from devices with ids: {self.device_ids}")
+            logger.info("rtl433: Listening messages from devices with ids: %s", self._device_id_list)
 
     def _parse_cmd(self, cmd):
-        return cmd.split()
+        # shlex, not str.split, so quoted arguments (e.g. a -F option with spaces or
+        # a "sh -c '...'" wrapper) reach rtl_433 intact.
+        return tuple(shlex.split(cmd))
 
     def terminate_subprocess(self):
-        if self.p.returncode is None:
+        self._stopping = True
+        if self.p is not None and self.p.returncode is None:
             logger.debug("rtl433: Terminating rtl_433 subprocess")
-            os.killpg(os.getpgid(self.p.pid), signal.SIGTERM)
+            # rtl_433 leads its own session, so its process group id is its pid. It may
+            # have exited on its own and not been reaped yet; there is nothing to stop.
+            try:
+                os.killpg(self.p.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
 
     async def _read_stream(self, stream, callback):
+        # Every complete line from one read is handed over as a single batch. The last
+        # element of the split is an incomplete line (or b""); carry it over into the
+        # next chunk, and flush it if the stream ends without a newline.
+        pending = b""
         while True:
-            line = await stream.readline()
-            if not line:
+            chunk = await stream.read(READ_CHUNK_SIZE)
+            if not chunk:
                 break
-            callback(line.decode("utf-8"))
+            *lines, pending = (pending + chunk).split(b"\n")
+            if lines:
+                callback(lines)
+        if pending:
+            callback([pending])
 
     async def background_job(self):
-        logger.debug(f"rtl433: Will listen for data using {self.cmd}")
+        logger.debug("rtl433: Will listen for data using %s", self.cmd)
         logger.info("rtl433: Listening for data")
-        self.p = await asyncio.create_subprocess_exec(self.cmd[0], *self.cmd[1:], stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-        await asyncio.gather(
-            self._read_stream(self.p.stdout, self.read_stdout),
-            self._read_stream(self.p.stderr, self.read_stderr),
+        # rtl_433's stderr is only ever logged as warnings; when those are disabled
+        # (--log-level error) discard it at the pipe rather than reading it at all.
+        log_stderr = logger.isEnabledFor(logging.WARNING)
+
+        # rtl_433 gets its own session (and process group), so terminate_subprocess
+        # signals only rtl_433 and not the exporter that is handling the shutdown.
+        self.p = await asyncio.create_subprocess_exec(
+            self.cmd[0],
+            *self.cmd[1:],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE if log_stderr else asyncio.subprocess.DEVNULL,
+            start_new_session=True,
         )
+        if self._stopping:
+            self.terminate_subprocess()
+        streams = [self._read_stream(self.p.stdout, self.read_stdout)]
+        if log_stderr:
+            streams.append(self._read_stream(self.p.stderr, self.read_stderr))
+        await asyncio.gather(*streams)
 
         rc = await self.p.wait()
-        self.future.set_result(rc)
-        logger.debug(f"rtl433: rtl_433 exited with code {self.p.returncode}")
-
-    def run(self):
-        try:
-            asyncio.run(self.background_job())
-        except Exception as e:
-            self.future.set_exception(e)
-
-    def read_stdout(self, line):
-        try:
-            data = json.loads(line)
+        logger.debug("rtl433: rtl_433 exited with code %s", rc)
+        return rc
+
+    def read_stdout(self, lines):
+        for line in lines:
+            if not any(needle in line for needle in self._model_needles):
+                continue
+            if self._id_pattern is not None and self._id_pattern.search(line) is None:
+                continue
+
+            # ValueError covers both decoders' JSONDecodeError and undecodable UTF-8.
+            try:
+                data = _json_loads(line)
+            except ValueError:
+                logger.error("rtl433: Failed to parse rtl_433's json output: %s", line.decode("utf-8", "replace").strip())
+                continue
             self.process_data(data)
-        except json.JSONDecodeError:
-            logger.error(f"rtl433: Failed to parse rtl_433's json output: {line.strip()}")
 
-    def read_stderr(self, line):
-        line = line.strip()
-        if line != "":
-            logger.warning(f"rtl_433: {line}")
+    def read_stderr(self, lines):
+        # Decode only lines that are going to be logged.
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+        for line in lines:
+            line = line.strip()
+            if line:
+                logger.warning("rtl_433: %s", line.decode("utf-8", "replace"))
 
     def process_data(self, data):
         if data.get("model", None) not in self.models:
             return
 
         if "id" not in data:
-            logger.error(f"rtl433: No ID in received data: {data}")
+            logger.error("rtl433: No ID in received data: %s", data)
             return
 
         device_id = data["id"]
-        if len(self.device_ids) > 0 and device_id not in self.device_ids:
-            logger.debug(f"rtl433: Received message from ID {device_id} (0x{device_id:x}), expected one of {self.device_ids}. Ignoring.")
+        if self.device_ids and device_id not in self.device_ids:
+            logger.debug("rtl433: Received message from ID %s (0x%x), expected one of %s. Ignoring.", device_id, device_id, self._device_id_list)
+            return
+
+        now = time.monotonic()
+        fingerprint = tuple(item for item in data.items() if item[0] not in _VOLATILE_KEYS)
+        key = (data["model"], device_id)
+        last = self._last_message.get(key)
+        if last is not None and last[0] == fingerprint and now - last[1] < DUPLICATE_WINDOW:
+            logger.debug("rtl433: Ignoring repeated message from %s id=%s", data["model"], device_id)
             return
+        self._last_message[key] = (fingerprint, now)
 
         logger.info("rtl433: Received %s id=%s (0x%x)", data["model"], device_id, device_id)
-        logger.debug(f"rtl433: Received data {data}")
-        self.signal.send(data)
+        logger.debug("rtl433: Received data %s", data)
+        self.callback(data)
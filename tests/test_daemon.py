@@ -0,0 +1,54 @@
+"""Hand-off of accepted messages from the reader to the VictoriaMetrics publisher."""
+
+import threading
+
+import pytest
+
+from rtl433_meteo import daemon
+from rtl433_meteo.daemon import MeteoExporterDaemon
+
+
+@pytest.fixture
+def exporter():
+    return MeteoExporterDaemon("true", [], "http://vm.example")
+
+
+def test_publisher_thread_pushes_queued_messages_in_order(exporter, ws90, vevor, monkeypatch):
+    pushed = []
+    monkeypatch.setattr(exporter.pub_vm, "data_callback", pushed.append)
+    exporter._enqueue(ws90)
+    exporter._enqueue(vevor)
+    exporter._enqueue(None)
+    exporter._publish()  # returns on the None sentinel
+    assert pushed == [ws90, vevor]
+
+
+def test_publisher_survives_a_failing_push(exporter, ws90, monkeypatch):
+    def boom(data):
+        raise KeyError("time")
+
+    monkeypatch.setattr(exporter.pub_vm, "data_callback", boom)
+    exporter._enqueue(ws90)
+    exporter._enqueue(None)
+    exporter._publish()  # must not raise
+    assert exporter.queue.empty()
+
+
+def test_full_queue_drops_oldest_message(monkeypatch, ws90, vevor):
+    monkeypatch.setattr(daemon, "PUBLISH_QUEUE_SIZE", 2)
+    exporter = MeteoExporterDaemon("true", [], "http://vm.example")
+    newest = dict(ws90, temperature_C=30.0)
+    for data in (vevor, ws90, newest):
+        exporter._enqueue(data)
+    assert [exporter.queue.get_nowait() for _ in range(2)] == [ws90, newest]
+
+
+def test_shutdown_reports_messages_left_in_queue(exporter, ws90, vevor, monkeypatch, caplog):
+    release = threading.Event()
+    monkeypatch.setattr(exporter.pub_vm, "data_callback", lambda data: release.wait(5))
+    monkeypatch.setattr(daemon, "PUBLISH_DRAIN_TIMEOUT", 0.1)
+    for data in (ws90, vevor, ws90):
+        exporter._enqueue(data)
+    exporter.run()  # rtl_433 is "true", so this goes straight to shutdown
+    release.set()
+    assert "Shutting down with 2 message(s) not pushed" in caplog.text
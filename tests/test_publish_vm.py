@@ -1,12 +1,13 @@
 """VictoriaMetrics CSV construction (no network)."""
 
 import datetime
+import time
 
 import pytest
 import requests
 
 from rtl433_meteo import stations
-from rtl433_meteo.publish_vm import VictoriaMetricsPublisher
+from rtl433_meteo.publish_vm import VictoriaMetricsPublisher, _parse_time
 
 
 @pytest.fixture
@@ -14,13 +15,13 @@ def publisher():
     return VictoriaMetricsPublisher("http://vm.example")
 
 
-def _dt(data):
-    return datetime.datetime.strptime(data["time"], "%Y-%m-%d %H:%M:%S")
+def _ts(data):
+    return int(datetime.datetime.strptime(data["time"], "%Y-%m-%d %H:%M:%S").timestamp())
 
 
 def test_metrics_csv_uses_generic_names_and_transforms(publisher, ws90):
     station = stations.STATIONS[ws90["model"]]
-    line, columns = publisher._construct_metrics(ws90, station, _dt(ws90))
+    line, columns = publisher._construct_metrics(ws90, station, _ts(ws90))
 
     assert columns[0] == "1:time:unix_s"
     row = dict(zip((c.split(":")[-1] for c in columns[1:]), line[1:]))
@@ -33,7 +34,7 @@ def test_metrics_csv_includes_fsk_radio_level_fields(publisher, ws90):
     # rtl_433 "-M level" attaches signal/frequency fields to every message; FSK
     # devices (WS90) report freq1/freq2, mapped to meteo_freq_mhz / meteo_freq2_mhz.
     station = stations.STATIONS[ws90["model"]]
-    line, columns = publisher._construct_metrics(ws90, station, _dt(ws90))
+    line, columns = publisher._construct_metrics(ws90, station, _ts(ws90))
 
     row = dict(zip((c.split(":")[-1] for c in columns[1:]), line[1:]))
     assert row["meteo_rssi_db"] == pytest.approx(-0.108)
@@ -46,7 +47,7 @@ def test_metrics_csv_includes_fsk_radio_level_fields(publisher, ws90):
 def test_metrics_csv_maps_single_ask_freq(publisher, vevor):
     # OOK/ASK devices (Vevor) report a single freq, mapped to meteo_freq_mhz.
     station = stations.STATIONS[vevor["model"]]
-    line, columns = publisher._construct_metrics(vevor, station, _dt(vevor))
+    line, columns = publisher._construct_metrics(vevor, station, _ts(vevor))
 
     names = [c.split(":")[-1] for c in columns]
     row = dict(zip((c.split(":")[-1] for c in columns[1:]), line[1:]))
@@ -59,7 +60,7 @@ def test_radio_fields_are_skipped_without_level_reporting(publisher, ws90):
     for key in ("rssi", "snr", "noise", "freq", "freq1", "freq2", "mod"):
         ws90.pop(key, None)
     station = stations.STATIONS[ws90["model"]]
-    line, columns = publisher._construct_metrics(ws90, station, _dt(ws90))
+    line, columns = publisher._construct_metrics(ws90, station, _ts(ws90))
 
     names = [c.split(":")[-1] for c in columns]
     assert not any(n.startswith("meteo_rssi") or n.startswith("meteo_freq") for n in names)
@@ -71,7 +72,7 @@ def test_metrics_csv_skips_fields_absent_from_message(publisher, vevor):
     # without "uvi", which must be skipped rather than raise KeyError.
     del vevor["uvi"]
     station = stations.STATIONS[vevor["model"]]
-    line, columns = publisher._construct_metrics(vevor, station, _dt(vevor))
+    line, columns = publisher._construct_metrics(vevor, station, _ts(vevor))
 
     names = [c.split(":")[-1] for c in columns]
     assert "meteo_uvi" not in names
@@ -84,15 +85,15 @@ def test_metrics_csv_skips_fields_absent_from_message(publisher, vevor):
 def test_info_csv_skips_absent_info_key(publisher, vevor):
     del vevor["channel"]
     station = stations.STATIONS[vevor["model"]]
-    line, columns = publisher._construct_info(vevor, station, _dt(vevor))
+    line, columns = publisher._construct_info(vevor, station, _ts(vevor))
 
     assert columns == ["1:time:unix_s", "2:metric:meteo_info"]
-    assert line == [int(_dt(vevor).timestamp()), 1]
+    assert line == [_ts(vevor), 1]
 
 
 def test_vevor_info_csv_uses_channel_not_firmware(publisher, vevor):
     station = stations.STATIONS[vevor["model"]]
-    line, columns = publisher._construct_info(vevor, station, _dt(vevor))
+    line, columns = publisher._construct_info(vevor, station, _ts(vevor))
 
     assert columns == ["1:time:unix_s", "2:metric:meteo_info", "3:label:channel"]
     assert line[1] == 1  # info metric value
@@ -101,7 +102,7 @@ def test_vevor_info_csv_uses_channel_not_firmware(publisher, vevor):
 
 def test_ws90_info_csv_uses_firmware(publisher, ws90):
     station = stations.STATIONS[ws90["model"]]
-    line, columns = publisher._construct_info(ws90, station, _dt(ws90))
+    line, columns = publisher._construct_info(ws90, station, _ts(ws90))
 
     assert columns[-1] == "3:label:firmware"
     assert line[-1] == 126
@@ -111,6 +112,7 @@ def test_post_passes_a_timeout(publisher, ws90, monkeypatch):
     calls = []
 
     def fake_post(url, **kwargs):
+        assert url == "http://vm.example/api/v1/import/csv"
         calls.append(kwargs)
 
         class Resp:
@@ -121,7 +123,7 @@ def test_post_passes_a_timeout(publisher, ws90, monkeypatch):
 
         return Resp()
 
-    monkeypatch.setattr("rtl433_meteo.publish_vm.requests.post", fake_post)
+    monkeypatch.setattr(publisher.session, "post", fake_post)
     publisher.data_callback(ws90)
 
     assert calls, "expected a POST to VictoriaMetrics"
@@ -145,7 +147,7 @@ def test_extra_label_is_one_param_per_label(publisher, ws90, monkeypatch):
 
         return Resp()
 
-    monkeypatch.setattr("rtl433_meteo.publish_vm.requests.post", fake_post)
+    monkeypatch.setattr(publisher.session, "post", fake_post)
     publisher.data_callback(ws90)
 
     for extra_label in calls:
@@ -159,8 +161,8 @@ def test_vm_outage_is_swallowed(publisher, ws90, monkeypatch):
     def boom(*a, **k):
         raise requests.ConnectionError("VM is down")
 
-    monkeypatch.setattr("rtl433_meteo.publish_vm.requests.post", boom)
-    # Must not raise -- a dead VM cannot be allowed to kill the reader thread.
+    monkeypatch.setattr(publisher.session, "post", boom)
+    # Must not raise -- a dead VM cannot be allowed to kill the publisher thread.
     publisher.data_callback(ws90)
 
 
@@ -171,8 +173,33 @@ def test_successful_push_logs_at_info(publisher, ws90, monkeypatch, caplog):
         def raise_for_status(self):
             pass
 
-    monkeypatch.setattr("rtl433_meteo.publish_vm.requests.post", lambda *a, **k: Resp())
+    monkeypatch.setattr(publisher.session, "post", lambda *a, **k: Resp())
     with caplog.at_level("INFO", logger="rtl433_meteo.publish_vm"):
         publisher.data_callback(ws90)
 
     assert any("Pushed Fineoffset-WS90 id=15132" in r.message for r in caplog.records)
+
+
+def test_extra_labels_are_built_once_per_device(publisher, ws90, vevor):
+    first = publisher._extra_labels(ws90["model"], ws90["id"])
+    assert first == ["id=15132", "model=Fineoffset-WS90"]
+    assert publisher._extra_labels(ws90["model"], ws90["id"]) is first
+    assert publisher._extra_labels(vevor["model"], vevor["id"]) == ["id=63735", "model=Vevor-7in1"]
+
+
+@pytest.fixture
+def utc_plus_2(monkeypatch):
+    # POSIX TZ offsets are west-positive: "UTC-2" is two hours ahead of UTC.
+    monkeypatch.setenv("TZ", "UTC-2")
+    time.tzset()
+    _parse_time.cache_clear()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+    _parse_time.cache_clear()
+
+
+def test_time_is_parsed_as_local_time(utc_plus_2):
+    # rtl_433 stamps local time: 21:06:32 at UTC+2 is 19:06:32 UTC.
+    assert _parse_time("2026-07-10 21:06:32") == 1783710392
+    assert _parse_time("2026-07-10 21:06:33") == 1783710393
@@ -1,47 +1,138 @@
 """RtlReader.process_data dispatch/filtering."""
 
+import asyncio
+import json
+import signal
+from types import SimpleNamespace
+
 import pytest
 
-from rtl433_meteo import stations
+from rtl433_meteo import rtl_reader, stations
 from rtl433_meteo.rtl_reader import RtlReader
 
 
-class RecordingSignal:
-    def __init__(self):
-        self.sent = []
-
-    def send(self, data):
-        self.sent.append(data)
+def make_reader(device_ids=()):
+    sent = []
+    reader = RtlReader("true", stations.STATIONS.keys(), list(device_ids), sent.append)
+    return reader, sent
 
 
-def make_reader(device_ids=()):
-    sig = RecordingSignal()
-    reader = RtlReader("true", stations.STATIONS.keys(), list(device_ids), sig, future=None)
-    return reader, sig
+@pytest.fixture(params=["orjson", "json"])
+def decoder(request, monkeypatch):
+    """Run read_stdout tests against both the orjson fast path and the stdlib fallback."""
+    module = pytest.importorskip(request.param)
+    monkeypatch.setattr(rtl_reader, "_json_loads", module.loads)
 
 
 def test_known_models_are_forwarded(ws90, vevor):
-    reader, sig = make_reader()
+    reader, sent = make_reader()
     reader.process_data(ws90)
     reader.process_data(vevor)
-    assert sig.sent == [ws90, vevor]
+    assert sent == [ws90, vevor]
 
 
 def test_unknown_model_is_ignored():
-    reader, sig = make_reader()
+    reader, sent = make_reader()
     reader.process_data({"model": "Acurite-5n1", "id": 1})
-    assert sig.sent == []
+    assert sent == []
 
 
 def test_message_without_id_is_ignored(ws90):
-    reader, sig = make_reader()
+    reader, sent = make_reader()
     del ws90["id"]
     reader.process_data(ws90)
-    assert sig.sent == []
+    assert sent == []
 
 
 def test_id_filter_restricts_devices(ws90, vevor):
-    reader, sig = make_reader(device_ids=[ws90["id"]])
+    reader, sent = make_reader(device_ids=[ws90["id"]])
     reader.process_data(ws90)   # id matches
     reader.process_data(vevor)  # id filtered out
-    assert sig.sent == [ws90]
+    assert sent == [ws90]
+
+
+def test_stdout_bytes_are_parsed_and_forwarded(ws90, decoder):
+    reader, sent = make_reader()
+    reader.read_stdout([json.dumps(ws90).encode()])
+    assert sent == [ws90]
+
+
+def test_malformed_stdout_line_is_logged_not_raised(caplog, decoder):
+    reader, sent = make_reader()
+    reader.read_stdout([b'{"model": "Fineoffset-WS90", \xff'])
+    assert sent == []
+    assert any("Failed to parse" in r.message for r in caplog.records)
+
+
+def test_read_stream_batches_lines_across_chunks():
+    async def feed(stream):
+        stream.feed_data(b'{"a": 1}\n{"b"')
+        await asyncio.sleep(0)  # let the reader consume the first chunk on its own
+        stream.feed_data(b': 2}\n\n{"c": 3}')  # last line has no trailing newline
+        stream.feed_eof()
+
+    async def read():
+        stream = asyncio.StreamReader()
+        batches = []
+        await asyncio.gather(make_reader()[0]._read_stream(stream, batches.append), feed(stream))
+        return batches
+
+    # One batch per read; the partial '{"b"' is carried into the next one.
+    assert asyncio.run(read()) == [[b'{"a": 1}'], [b'{"b": 2}', b""], [b'{"c": 3}']]
+
+
+def test_unknown_model_line_is_not_parsed(caplog, decoder):
+    # Lines without a known model string are dropped before decoding, so even a
+    # malformed one does not reach the JSON parser.
+    reader, sent = make_reader()
+    reader.read_stdout([b'{"model" : "Acurite-5n1", "id" : 1, broken'])
+    assert sent == []
+    assert not caplog.records
+
+
+def test_id_prefilter_matches_rtl433_spacing(ws90, vevor, decoder):
+    reader, sent = make_reader(device_ids=[ws90["id"]])
+    # rtl_433 itself separates keys and values with " : ".
+    reader.read_stdout([json.dumps(d, separators=(", ", " : ")).encode() for d in (ws90, vevor)])
+    assert sent == [ws90]
+
+
+def test_id_prefilter_pattern():
+    reader, _ = make_reader(device_ids=[151, 0x3B1])
+    assert reader._id_pattern.search(b'{"id" : 151, "x" : 1}')
+    assert reader._id_pattern.search(b'{"id":945}')  # 0x3B1
+    assert not reader._id_pattern.search(b'{"id" : 15132}')  # 151 is only a prefix
+
+
+def test_stderr_lines_are_logged_as_warnings(caplog):
+    reader, _ = make_reader()
+    reader.read_stderr([b"Found Rafael Micro R820T tuner\r", b"", b"  "])
+    assert [r.message for r in caplog.records] == ["rtl_433: Found Rafael Micro R820T tuner"]
+    assert all(r.levelname == "WARNING" for r in caplog.records)
+
+
+def test_cmd_honours_shell_quoting():
+    reader = RtlReader("rtl_433 -F 'json:/tmp/out file.json' -M level", (), [], print)
+    assert reader.cmd == ("rtl_433", "-F", "json:/tmp/out file.json", "-M", "level")
+
+
+def test_repeated_transmission_is_forwarded_once(ws90, monkeypatch):
+    clock = iter([100.0, 100.1, 100.2, 101.0])
+    # Replace the reader's reference to the time module, not time.monotonic itself.
+    monkeypatch.setattr(rtl_reader, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+    reader, sent = make_reader()
+
+    repeat = dict(ws90, rssi=-3.5, snr=20.1)  # same packet, different radio levels
+    changed = dict(ws90, temperature_C=21.6)
+    reader.process_data(ws90)
+    reader.process_data(repeat)  # dropped: same payload 0.1 s later
+    reader.process_data(changed)  # forwarded: payload differs
+    reader.process_data(dict(changed))  # forwarded: outside the duplicate window
+    assert sent == [ws90, changed, changed]
+
+
+def test_stop_requested_before_spawn_terminates_rtl433():
+    # A SIGINT/SIGTERM can arrive before background_job has started rtl_433.
+    reader = RtlReader("sleep 30", stations.STATIONS.keys(), [], print)
+    reader.terminate_subprocess()
+    assert asyncio.run(asyncio.wait_for(reader.background_job(), 5)) == -signal.SIGTERM